@@ -8,6 +8,7 @@
 #
 # Usage:
 #   ./article3.sh <OLLAMA_HOST> <URL> [OLLAMA_MODEL] [SUMMARY_LENGTH] [REPEATED]
+#   ./article3.sh --stream <OLLAMA_HOST> [OLLAMA_MODEL] [SUMMARY_LENGTH]
 #
 # Parameters:
 #   OLLAMA_HOST   - Required first parameter, host:port for Ollama server (e.g., 192.168.0.8:11434)
@@ -15,6 +16,12 @@
 #   OLLAMA_MODEL  - Optional, model to use (default: qwen2.5:14b)
 #   SUMMARY_LENGTH - Optional, character length for summary (default: 257)
 #   REPEATED      - Optional, set to "REPEATED" to allow processing of repeated content (default: detect repeats)
+#
+# Stream mode:
+#   With --stream the script stays resident, reads one URL per line from
+#   stdin and writes one summary per line to stdout. Server/model checks
+#   run once instead of per URL, so callers avoid a fork/exec and fresh
+#   TCP connection for every article.
 
 # Get the script name dynamically for cache directory
 SCRIPT_NAME=$(basename "$0" .sh)
@@ -81,19 +88,31 @@ unload_ollama_models() {
 if [ $# -lt 2 ]; then
     echo "Error: Missing required parameters" >&2
     echo "Usage: $SCRIPT_NAME <OLLAMA_HOST> <URL> [OLLAMA_MODEL] [SUMMARY_LENGTH] [REPEATED]" >&2
+    echo "       $SCRIPT_NAME --stream <OLLAMA_HOST> [OLLAMA_MODEL] [SUMMARY_LENGTH]" >&2
     exit 1
 fi
 
 # Configuration
-OLLAMA_HOST="$1"
-validate_ollama_host "$OLLAMA_HOST" "article3 main module"
-URL="$2"
-OLLAMA_MODEL="${3:-qwen2.5:14b}"
-SUMMARY_LENGTH="${4:-257}"
-ALLOW_REPEATED="${5:-no}"
+STREAM_MODE="no"
+if [ "$1" = "--stream" ]; then
+    STREAM_MODE="yes"
+    shift
+    OLLAMA_HOST="$1"
+    validate_ollama_host "$OLLAMA_HOST" "article3 main module"
+    OLLAMA_MODEL="${2:-qwen2.5:14b}"
+    SUMMARY_LENGTH="${3:-257}"
+    ALLOW_REPEATED="no"
+else
+    OLLAMA_HOST="$1"
+    validate_ollama_host "$OLLAMA_HOST" "article3 main module"
+    URL="$2"
+    OLLAMA_MODEL="${3:-qwen2.5:14b}"
+    SUMMARY_LENGTH="${4:-257}"
+    ALLOW_REPEATED="${5:-no}"
+fi
 
 SUMMARY_PROMPT="Respond ONLY with the ${SUMMARY_LENGTH}-character summary. No thinking output. Summary: $(cat <<'EOF'
-Provide a concise summary of this article in exactly ${SUMMARY_LENGTH} characters or less (including spaces). 
+Provide a concise summary of this article in exactly ${SUMMARY_LENGTH} characters or less (including spaces).
 Focus on key points and policy implications if any.
 EOF
 )"
@@ -103,12 +122,13 @@ echo "Using host: $OLLAMA_HOST" >&2
 echo "Using model: $OLLAMA_MODEL" >&2
 echo "Summary length: $SUMMARY_LENGTH" >&2
 echo "Allow repeated content: $ALLOW_REPEATED" >&2
+echo "Stream mode: $STREAM_MODE" >&2
 
 # Verify Ollama connection
 check_ollama_server() {
     local host="$1"
     validate_ollama_host "$host" "check_ollama_server"
-    
+
     echo "Checking Ollama server status..." >&2
     if ! curl -s "http://$host/api/tags" >/dev/null; then
         echo "Error: Cannot connect to Ollama at $host" >&2
@@ -123,7 +143,7 @@ check_model_available() {
     local host="$1"
     local model="$2"
     validate_ollama_host "$host" "check_model_available"
-    
+
     echo "Checking if model '$model' is available..." >&2
     if ! curl -s "http://$host/api/tags" | jq -e ".models[] | select(.name == \"$model\")" >/dev/null; then
         echo "Error: Model '$model' not found on server" >&2
@@ -140,8 +160,6 @@ check_model_available "$OLLAMA_HOST" "$OLLAMA_MODEL"
 # Cache setup
 CACHE_DIR="${HOME}/.cache/${SCRIPT_NAME}"
 mkdir -p "$CACHE_DIR"
-URL_HASH=$(echo -n "$URL" | md5sum | awk '{print $1}')
-CACHE_FILE="${CACHE_DIR}/${URL_HASH}.txt"
 
 # Check dependencies
 for cmd in curl lynx jq stat; do
@@ -150,21 +168,23 @@ done
 
 # Check for repeated content
 check_repeated_content() {
+    local cache_file="$1"
+
     if [ "$ALLOW_REPEATED" = "REPEATED" ]; then
         echo "Skipping repeat check (REPEATED flag set)" >&2
         return 1
     fi
 
-    if [ -f "$CACHE_FILE" ]; then
+    if [ -f "$cache_file" ]; then
         current_time=$(date +%s)
-        if stat -f %m "$CACHE_FILE" >/dev/null 2>&1; then
-            file_mtime=$(stat -f %m "$CACHE_FILE")
+        if stat -f %m "$cache_file" >/dev/null 2>&1; then
+            file_mtime=$(stat -f %m "$cache_file")
         else
-            file_mtime=$(stat -c %Y "$CACHE_FILE")
+            file_mtime=$(stat -c %Y "$cache_file")
         fi
-        
+
         cache_age_hours=$(( (current_time - file_mtime) / 3600 ))
-        
+
         if [ $cache_age_hours -lt 24 ]; then
             echo "REPEATED"
             return 0
@@ -173,41 +193,36 @@ check_repeated_content() {
     return 1
 }
 
-# Check for repeated content before processing
-if repeated_result=$(check_repeated_content); then
-    echo "$repeated_result"
-    exit 0
-fi
+# Fetch article content for a URL, refreshing the per-URL cache file
+fetch_article_content() {
+    local url="$1"
+    local cache_file="$2"
+    # Modern Chrome user agent string
+    local chrome_ua="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
 
-# Get article content with caching
-if [ -f "$CACHE_FILE" ]; then
-    current_time=$(date +%s)
-    if stat -f %m "$CACHE_FILE" >/dev/null 2>&1; then
-        file_mtime=$(stat -f %m "$CACHE_FILE")
-    else
-        file_mtime=$(stat -c %Y "$CACHE_FILE")
-    fi
-    
-    cache_age_hours=$(( (current_time - file_mtime) / 3600 ))
-    echo "Cache file age: ${cache_age_hours}h" >&2
-    
-    if [ $cache_age_hours -ge 24 ]; then
-        echo "Refreshing expired cache..." >&2
-        # Modern Chrome user agent string
-        CHROME_UA="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
-        ARTICLE_CONTENT=$(curl -s -L -A "$CHROME_UA" "$URL" | lynx -dump -stdin -nolist -width=80)
-        echo "$ARTICLE_CONTENT" > "$CACHE_FILE"
+    if [ -f "$cache_file" ]; then
+        current_time=$(date +%s)
+        if stat -f %m "$cache_file" >/dev/null 2>&1; then
+            file_mtime=$(stat -f %m "$cache_file")
+        else
+            file_mtime=$(stat -c %Y "$cache_file")
+        fi
+
+        cache_age_hours=$(( (current_time - file_mtime) / 3600 ))
+        echo "Cache file age: ${cache_age_hours}h" >&2
+
+        if [ $cache_age_hours -ge 24 ]; then
+            echo "Refreshing expired cache..." >&2
+            curl -s -L -A "$chrome_ua" "$url" | lynx -dump -stdin -nolist -width=80 > "$cache_file"
+        else
+            echo "Using cached content" >&2
+        fi
     else
-        echo "Using cached content" >&2
-        ARTICLE_CONTENT=$(cat "$CACHE_FILE")
+        echo "Fetching new content..." >&2
+        curl -s -L -A "$chrome_ua" "$url" | lynx -dump -stdin -nolist -width=80 > "$cache_file"
     fi
-else
-    echo "Fetching new content..." >&2
-    # Modern Chrome user agent string
-    CHROME_UA="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
-    ARTICLE_CONTENT=$(curl -s -L -A "$CHROME_UA" "$URL" | lynx -dump -stdin -nolist -width=80)
-    echo "$ARTICLE_CONTENT" > "$CACHE_FILE"
-fi
+    cat "$cache_file"
+}
 
 # Clean thinking tags
 clean_thinking() {
@@ -230,13 +245,13 @@ generate_summary() {
     local prompt="$3"
     local content="$4"
     validate_ollama_host "$host" "generate_summary"
-    
+
     local full_prompt="${prompt}\n\n${content}"
     echo "Generating summary (this may take a moment)..." >&2
-    
+
     # Format prompt as JSON safely
     local prompt_json=$(jq -n --arg prompt "$full_prompt" '$prompt')
-    
+
     echo "Sending API request..." >&2
     local response=$(curl -s -X POST "http://$host/api/generate" \
         -H "Content-Type: application/json" \
@@ -245,41 +260,72 @@ generate_summary() {
             prompt: $prompt,
             stream: false
         }')" 2>&1)
-    
+
     if [ $? -ne 0 ]; then
         echo "API request failed" >&2
         echo "Error details: $response" >&2
         return 1
     fi
-    
+
     if ! echo "$response" | jq -e '.response' >/dev/null; then
         echo "Invalid API response format" >&2
         echo "Raw response: $response" >&2
         return 1
     fi
-    
+
     echo "$response" | jq -r '.response'
 }
 
-# Main summary generation
-unload_ollama_models "$OLLAMA_HOST"
-summary=$(generate_summary "$OLLAMA_HOST" "$OLLAMA_MODEL" "$SUMMARY_PROMPT" "$ARTICLE_CONTENT" | clean_thinking)
+# Summarize one URL (cache check, fetch, generate, validate)
+summarize_url() {
+    local url="$1"
+    local url_hash
+    url_hash=$(echo -n "$url" | md5sum | awk '{print $1}')
+    local cache_file="${CACHE_DIR}/${url_hash}.txt"
+
+    # Check for repeated content before processing
+    local repeated_result
+    if repeated_result=$(check_repeated_content "$cache_file"); then
+        echo "$repeated_result"
+        return 0
+    fi
 
-# Fallback if empty
-if [[ -z "$summary" || "$summary" =~ ^[[:space:]]*$ ]]; then
-    echo "Warning: Empty summary received, using fallback content" >&2
-    summary="[Error: No summary generated]"
-fi
+    local article_content
+    article_content=$(fetch_article_content "$url" "$cache_file")
 
-# Validate length
-length=$(echo -n "$summary" | wc -m)
-echo "Generated summary length: $length/$SUMMARY_LENGTH" >&2
+    # Main summary generation
+    unload_ollama_models "$OLLAMA_HOST"
+    local summary
+    summary=$(generate_summary "$OLLAMA_HOST" "$OLLAMA_MODEL" "$SUMMARY_PROMPT" "$article_content" | clean_thinking)
 
-if [ $length -gt $SUMMARY_LENGTH ]; then
-    echo "Warning: Summary exceeded ${SUMMARY_LENGTH} characters ($length)" >&2
-fi
+    # Fallback if empty
+    if [[ -z "$summary" || "$summary" =~ ^[[:space:]]*$ ]]; then
+        echo "Warning: Empty summary received, using fallback content" >&2
+        summary="[Error: No summary generated]"
+    fi
+
+    # Validate length
+    local length
+    length=$(echo -n "$summary" | wc -m)
+    echo "Generated summary length: $length/$SUMMARY_LENGTH" >&2
+
+    if [ $length -gt $SUMMARY_LENGTH ]; then
+        echo "Warning: Summary exceeded ${SUMMARY_LENGTH} characters ($length)" >&2
+    fi
+
+    # Final output (to stdout)
+    echo "$summary"
 
-# Final output (to stdout)
-echo "$summary"
+    unload_ollama_models "$OLLAMA_HOST"
+}
 
-unload_ollama_models "$OLLAMA_HOST"
+if [ "$STREAM_MODE" = "yes" ]; then
+    # Stay resident: one URL per line in, one summary per line out
+    while IFS= read -r url; do
+        [ -z "$url" ] && continue
+        summary_line=$(summarize_url "$url")
+        printf '%s\n' "${summary_line//$'\n'/ }"
+    done
+else
+    summarize_url "$URL"
+fi
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sqlite3
 import csv
+import heapq
 import sys
 from pathlib import Path
 
@@ -14,71 +15,102 @@ def compare_csv_with_table(csv_filename, db_path):
     """Thoroughly compare all CSV contents with database table"""
     folder_name = get_folder_name_from_filename(Path(csv_filename).name)
     
-    # Read all CSV data
-    csv_data = []
-    with open(csv_filename, 'r', encoding='utf-8') as csvfile:
+    conn = sqlite3.connect(db_path)
+    # Read-mostly workload: WAL, relaxed fsync, 64 MiB cache, 256 MiB
+    # mmap and in-memory temp tables for the EXCEPT/INTERSECT sorts
+    conn.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA temp_store=MEMORY;
+    """)
+    cursor = conn.cursor()
+
+    # Load the CSV into a TEMP table so SQLite can compute the diff in C
+    # instead of hashing tuples of strings in Python; large read buffer
+    # keeps the csv parser off the syscall path
+    cursor.execute("CREATE TEMP TABLE csv_in (promotion TEXT, url TEXT)")
+    with open(csv_filename, 'r', encoding='utf-8', buffering=1 << 20) as csvfile:
         reader = csv.reader(csvfile)
         next(reader)  # Skip header
-        for row in reader:
-            if len(row) >= 2:
-                # Normalize by stripping whitespace
-                promotion = row[0].strip()
-                url = row[1].strip()
-                csv_data.append((promotion, url))
-    
-    if not csv_data:
+        cursor.execute("BEGIN")
+        # Normalize by stripping whitespace
+        cursor.executemany(
+            "INSERT INTO csv_in (promotion, url) VALUES (?, ?)",
+            ((row[0].strip(), row[1].strip()) for row in reader if len(row) >= 2)
+        )
+        conn.commit()
+    cursor.execute("CREATE INDEX idx_csv_in ON csv_in (url, promotion)")
+
+    csv_count = cursor.execute("SELECT COUNT(*) FROM csv_in").fetchone()[0]
+    if csv_count == 0:
+        conn.close()
         print("CSV file contains no data rows (only header)")
         return False
-    
-    print(f"CSV contains {len(csv_data)} records")
-    
-    # Read all matching database data
-    db_data = []
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("""
-    SELECT promotion, url FROM integration 
-    WHERE folder_name = ?
-    ORDER BY url
-    """, (folder_name,))
-    
-    db_data = [(row[0].strip(), row[1].strip()) for row in cursor.fetchall()]
+
+    print(f"CSV contains {csv_count} records")
+
+    db_count = cursor.execute(
+        "SELECT COUNT(*) FROM integration WHERE folder_name = ?",
+        (folder_name,)
+    ).fetchone()[0]
+    print(f"Database contains {db_count} matching records")
+
+    # Trim the DB side with the same whitespace set Python's .strip()
+    # removed from the CSV rows; bare TRIM() only drops spaces, which
+    # would report a trailing tab/newline as a permanent mismatch
+    ws = "char(9)||char(10)||char(11)||char(12)||char(13)||' '"
+    db_side = (f"SELECT TRIM(promotion, {ws}), TRIM(url, {ws}) "
+               "FROM integration WHERE folder_name = ?")
+
+    # Diff in both directions with EXCEPT; only the (typically tiny)
+    # difference rows ever cross the sqlite->python boundary
+    csv_only = cursor.execute(f"""
+    SELECT promotion, url FROM csv_in
+    EXCEPT
+    {db_side}
+    """, (folder_name,)).fetchall()
+
+    db_only = cursor.execute(f"""
+    {db_side}
+    EXCEPT
+    SELECT promotion, url FROM csv_in
+    """, (folder_name,)).fetchall()
+
+    matching = cursor.execute(f"""
+    SELECT COUNT(*) FROM (
+        SELECT promotion, url FROM csv_in
+        INTERSECT
+        {db_side}
+    )
+    """, (folder_name,)).fetchone()[0]
     conn.close()
-    
-    print(f"Database contains {len(db_data)} matching records")
-    
-    # Convert to sets for comparison
-    csv_set = set(csv_data)
-    db_set = set(db_data)
-    
-    # Check for missing records in either direction
-    csv_only = csv_set - db_set
-    db_only = db_set - csv_set
-    
+
     if not csv_only and not db_only:
         print("Perfect match! All records identical.")
         return True
-    
+
     # Report discrepancies
     if csv_only:
         print(f"\n{len(csv_only)} records found in CSV but not in database:")
-        for i, record in enumerate(sorted(csv_only)[:5], 1):  # Show first 5 as sample
+        for i, record in enumerate(heapq.nsmallest(5, csv_only), 1):  # Show first 5 as sample
             print(f"  {i}. Promotion: {record[0][:50]}... | URL: {record[1][:50]}...")
         if len(csv_only) > 5:
             print(f"  ... and {len(csv_only)-5} more")
     
     if db_only:
         print(f"\n{len(db_only)} records found in database but not in CSV:")
-        for i, record in enumerate(sorted(db_only)[:5], 1):  # Show first 5 as sample
+        for i, record in enumerate(heapq.nsmallest(5, db_only), 1):  # Show first 5 as sample
             print(f"  {i}. Promotion: {record[0][:50]}... | URL: {record[1][:50]}...")
         if len(db_only) > 5:
             print(f"  ... and {len(db_only)-5} more")
     
     # Detailed count comparison
     print("\nSummary:")
-    print(f"Total CSV records: {len(csv_data)}")
-    print(f"Total DB records: {len(db_data)}")
-    print(f"Matching records: {len(csv_set & db_set)}")
+    print(f"Total CSV records: {csv_count}")
+    print(f"Total DB records: {db_count}")
+    print(f"Matching records: {matching}")
     
     return False
 
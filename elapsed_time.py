@@ -8,13 +8,14 @@ def format_duration(seconds):
     - Minutes and up: Shows all relevant units, space-separated (e.g., "2m 30s", "1h 30m 45s")
     - Supports up to weeks for long-running operations
     """
-    # Break down the duration into components
-    weeks = int(seconds // (7 * 24 * 60 * 60))
-    days = int((seconds % (7 * 24 * 60 * 60)) // (24 * 60 * 60))
-    hours = int((seconds % (24 * 60 * 60)) // (60 * 60))
-    minutes = int((seconds % (60 * 60)) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int(round((seconds - int(seconds)) * 1000))
+    # Break down the duration with one divmod cascade over integer
+    # milliseconds instead of repeated float modulo/division
+    ms_total = int(round(seconds * 1000))
+    secs_total, milliseconds = divmod(ms_total, 1000)
+    minutes, secs = divmod(secs_total, 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    weeks, days = divmod(days, 7)
 
     def format_seconds(secs, ms):
         if secs == 0 and ms > 0:
@@ -24,26 +25,16 @@ def format_duration(seconds):
         else:
             return f"{secs}.{ms:03d}s"
 
-    # Build the output according to the most significant non-zero unit
+    # Walk a unit table instead of a cascaded if/elif: units before the
+    # first non-zero one are dropped, everything after it is kept
     parts = []
-    if weeks > 0:
-        parts.append(f"{weeks}w")
-        parts.append(f"{days}d")
-        parts.append(f"{hours}h")
+    for value, suffix in ((weeks, 'w'), (days, 'd'), (hours, 'h')):
+        if parts or value > 0:
+            parts.append(f"{value}{suffix}")
+    if parts or minutes > 0:
         parts.append(f"{minutes}m")
-        parts.append(format_seconds(secs, milliseconds))
-    elif days > 0:
-        parts.append(f"{days}d")
-        parts.append(f"{hours}h")
-        parts.append(f"{minutes}m")
-        parts.append(format_seconds(secs, milliseconds))
-    elif hours > 0:
-        parts.append(f"{hours}h")
-        parts.append(f"{minutes}m")
-        parts.append(format_seconds(secs, milliseconds))
-    elif minutes > 0:
-        parts.append(f"{minutes}m")
-        if secs > 0 or milliseconds > 0:
+        # A bare minutes reading omits a zero seconds field
+        if len(parts) > 1 or secs > 0 or milliseconds > 0:
             parts.append(format_seconds(secs, milliseconds))
     else:
         parts.append(format_seconds(secs, milliseconds))
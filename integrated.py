@@ -5,83 +5,100 @@ import sys
 import sqlite3
 from pathlib import Path
 import csv
+import functools
 import re
+import signal
 import subprocess
 import time
-import psutil
 import threading
 import unicodedata
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from queue import Queue
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, as_completed
+
+# Environment for article3.sh workers, built once at import instead of
+# copying os.environ per spawn
+_SUBPROC_ENV = {**os.environ, 'TERM': 'dumb'}
 
 class OllamaWorkerPool:
     def __init__(self, hosts):
         self.hosts = hosts
         self.task_queue = Queue()
-        self.result_queue = Queue()
         self.workers = []
+        self.procs = {}
+        self.proc_locks = {}
         self.shutdown_flag = False
-        
+
     def start(self):
-        """Start worker threads"""
-        for host in self.hosts:
+        """Start one persistent article3.sh process and worker thread per
+        hosts entry. The process reads URL-per-line from stdin and writes one
+        summary per line, so each URL costs a pipe write instead of a
+        fork/exec plus a fresh TCP connection to ollama. Workers are keyed
+        by index, so repeating a host on the command line opens another
+        concurrent stream against that server"""
+        for worker_id, host in enumerate(self.hosts):
+            self.procs[worker_id] = subprocess.Popen(
+                ["./article3.sh", "--stream", host],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=_SUBPROC_ENV
+            )
+            self.proc_locks[worker_id] = threading.Lock()
             worker = threading.Thread(
                 target=self._worker_loop,
-                args=(host,),
+                args=(worker_id, host),
                 daemon=True
             )
             worker.start()
             self.workers.append(worker)
     
-    def _worker_loop(self, host):
+    def _worker_loop(self, worker_id, host):
         """Worker thread processing loop"""
         while not self.shutdown_flag:
             try:
                 task = self.task_queue.get(timeout=1)
                 if task is None:  # Sentinel value for shutdown
                     break
-                    
-                url, callback = task
+
+                url, future = task
                 try:
-                    result = self._process_url(host, url)
-                    self.result_queue.put((url, result))
-                    if callback:
-                        callback(url, result)
+                    future.set_result(self._process_url(worker_id, host, url))
                 except Exception as e:
-                    print(f"Worker error on {host}: {str(e)}")
+                    future.set_exception(e)
                 finally:
                     self.task_queue.task_done()
             except:
                 continue
     
-    def _process_url(self, host, url):
-        """Process a single URL using the specified host"""
+    def _process_url(self, worker_id, host, url):
+        """Send one URL to this worker's persistent process"""
         try:
             start_time = time.time()
-            result = subprocess.run(
-                ["./article3.sh", host, url],
-                capture_output=True,
-                text=True,
-                check=True,
-                env={'TERM': 'dumb', **os.environ}
-            )
+            proc = self.procs[worker_id]
+            # Serialize requests per process: one URL in, one line out
+            with self.proc_locks[worker_id]:
+                proc.stdin.write(url.encode('utf-8') + b"\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            if not line:
+                raise RuntimeError("worker process closed its pipe")
             processing_time = time.time() - start_time
             if processing_time > 30:  # Log slow processing
                 print(f"  [i] Processed in {processing_time:.1f}s on {host}: {url[:60]}...")
-            promotion = clean_text(result.stdout.strip())
-            return (promotion if promotion and "Error" not in promotion else "Error", 
-                    processing_time, 
+            promotion = clean_text_bytes(line.strip())
+            return (promotion if promotion and "Error" not in promotion else "Error",
+                    processing_time,
                     host)
-        except subprocess.CalledProcessError as e:
-            print(f"  [!] Process error on {host}: {clean_text(e.stderr.strip())[:200]}...")
-            return ("Error", 0, host)
         except Exception as e:
             print(f"  [!] System error on {host}: {str(e)}")
             return ("Error", 0, host)
     
-    def add_task(self, url, callback=None):
-        """Add a URL processing task to the queue"""
-        self.task_queue.put((url, callback))
+    def submit(self, url):
+        """Queue a URL and return a Future for its (promotion, duration, host)"""
+        future = Future()
+        self.task_queue.put((url, future))
+        return future
     
     def shutdown(self):
         """Gracefully shutdown the worker pool"""
@@ -90,69 +107,138 @@ class OllamaWorkerPool:
             self.task_queue.put(None)
         for worker in self.workers:
             worker.join(timeout=5)
-
-def determine_promotion(url, worker_pool):
-    """Generate promotion using worker pool without timeouts"""
-    result_queue = Queue()
-    
-    def callback(url, result):
-        result_queue.put((url, result))
-    
-    worker_pool.add_task(url, callback)
-    
-    try:
-        _, result = result_queue.get()  # No timeout
-        return result
-    except Exception as e:
-        print(f"  [!] Queue error: {str(e)}")
-        return ("Error", 0, "unknown")
+        for proc in self.procs.values():
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=5)
+            except Exception:
+                proc.kill()
 
 def stop_liferea():
-    """Gracefully stop Liferea process if running"""
+    """Gracefully stop Liferea process if running. Uses pgrep for a
+    single lookup instead of scanning every /proc entry"""
     try:
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] == 'liferea':
-                print("Stopping Liferea process...")
-                proc.terminate()
-                try:
-                    proc.wait(5)
-                except psutil.TimeoutExpired:
-                    proc.kill()
+        try:
+            out = subprocess.run(['pgrep', '-x', 'liferea'],
+                                 capture_output=True, text=True)
+            if not out.stdout.strip():
+                return False
+            pid = int(out.stdout.split()[0])
+        except FileNotFoundError:
+            # No pgrep on this system; fall back to the slower /proc scan
+            import psutil
+            pid = next((p.info['pid'] for p in psutil.process_iter(['pid', 'name'])
+                        if p.info['name'] == 'liferea'), None)
+            if pid is None:
+                return False
+        print("Stopping Liferea process...")
+        os.kill(pid, signal.SIGTERM)
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
                 return True
-        return False
+            time.sleep(0.1)
+        os.kill(pid, signal.SIGKILL)
+        return True
     except Exception as e:
         print(f"Warning: Could not stop Liferea - {str(e)}")
         return False
 
+# Precompiled patterns: clean_text runs once per subprocess stdout, so
+# skip the re-cache lookup on every call
+_RE_ANSI = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_RE_ANSI_B = re.compile(rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_RE_WS = re.compile(r'\s+')
+
+# Single translation table for the post-ASCII cleanup: drops control
+# chars and maps '"' to "'" in one C-level pass
+_TRANS = dict.fromkeys(range(32), None)
+_TRANS[127] = None
+_TRANS[ord('"')] = ord("'")
+
 def clean_text(text):
     """Remove control characters and normalize to ASCII"""
     if not text:
         return ""
-    text = re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', text)
+    text = _RE_ANSI.sub('', text)
     text = unicodedata.normalize('NFKD', text)
     text = text.encode('ascii', 'ignore').decode('ascii')
-    text = re.sub(r'[\x00-\x1F\x7F]', '', text)
-    text = text.replace('"', "'").strip()
-    text = re.sub(r'\s+', ' ', text)
-    return text
+    text = text.translate(_TRANS)
+    return _RE_WS.sub(' ', text).strip()
 
+def clean_text_bytes(raw):
+    """clean_text for undecoded subprocess output: strip ANSI escapes
+    while the data is still bytes (the bytes regex engine skips
+    code-point walking), then decode once and reuse the str pipeline
+    for the NFKD/ASCII folding"""
+    if not raw:
+        return ""
+    return clean_text(_RE_ANSI_B.sub(b'', raw).decode('utf-8', 'ignore'))
+
+# Tracking parameters dropped during normalization
+_TRACK_EXACT = frozenset({'fbclid', 'gclid', 'sid'})
+_TRACK_PREFIXES = ('utm_', 'mc_')
+
+@functools.lru_cache(maxsize=65536)
 def normalize_url(url):
-    """Normalize URL for better deduplication"""
+    """Normalize URL for better deduplication. Pure function called
+    repeatedly on the same strings (SQL rows, progress bookkeeping,
+    export loop), so memoize by URL and pay the parse once.
+    One urlsplit pass replaces the old chain of regex substitutions:
+    force https, drop www. and tracking params, drop the fragment and
+    trailing slashes, lowercase"""
     if not url:
         return url
-    url = re.sub(r'[?&](utm_[^&]+|fbclid|gclid|mc_[^&]+)=[^&]*', '', url)
-    url = re.sub(r'[?&]sid=[^&]*', '', url)
-    url = re.sub(r'/#.*$', '', url)
-    url = re.sub(r'^http://', 'https://', url)
-    url = re.sub(r'^https://www\.', 'https://', url)
-    url = re.sub(r'/\?$', '', url)
-    url = re.sub(r'/$', '', url)
-    url = re.sub(r'\?$', '', url)
-    return url.lower().strip()
-
-def get_search_folders(db_path):
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        # Malformed URL (e.g. an unbalanced IPv6 bracket); a scraped
+        # feed must not abort the whole export, so fall back to the
+        # cheapest stable key
+        return url.lower().strip()
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    netloc = parts.netloc.lower()
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    query = ''
+    if parts.query:
+        kept = [(k, v) for k, v in parse_qsl(parts.query)
+                if not (k in _TRACK_EXACT or k.startswith(_TRACK_PREFIXES))]
+        query = urlencode(kept)
+    path = parts.path.rstrip('/')
+    return urlunsplit((scheme, netloc, path, query, '')).lower().strip()
+
+def _open(db_path):
+    """Open a sqlite connection tuned for this read-mostly workload:
+    WAL, relaxed fsync, 128 MiB page cache and 256 MiB mmap so the hot
+    joins run against memory after first access. Callers share one
+    connection per process (autocommit; transactions are explicit)"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-131072;
+    PRAGMA mmap_size=268435456;
+    PRAGMA temp_store=MEMORY;
+    """)
+    return conn
+
+def ensure_indexes(conn):
+    """Create covering indexes for the folder/item join so the planner
+    can satisfy get_article_urls from the indexes alone (no-op if they
+    already exist)"""
+    conn.executescript("""
+    CREATE INDEX IF NOT EXISTS idx_sfi_node ON search_folder_items (node_id, item_id);
+    CREATE INDEX IF NOT EXISTS idx_items_id_updated ON items (item_id, updated DESC);
+    ANALYZE;
+    """)
+
+def get_search_folders(conn):
     """Retrieve search folders from Liferea database"""
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute("""
     SELECT n.node_id, n.title, COUNT(sfi.item_id)
@@ -163,74 +249,169 @@ def get_search_folders(db_path):
     ORDER BY n.title
     """)
     folders = []
-    for row in cursor.fetchall():
+    # Iterate the cursor directly; no need to materialize the full
+    # result list first
+    for row in cursor:
         folders.append({
             'id': row[0],
             'title': row[1],
             'count': row[2]
         })
-    conn.close()
     return folders
 
-def get_article_urls(folder_id, db_path):
-    """Retrieve article URLs from a specific folder"""
-    conn = sqlite3.connect(db_path)
+@functools.lru_cache(maxsize=4)
+def _url_column(conn):
+    """Resolve which column in items holds article URLs. The schema is
+    fixed for the life of the process, so cache per connection and skip
+    the PRAGMA roundtrip on repeated folder exports"""
     cursor = conn.cursor()
     cursor.execute("PRAGMA table_info(items)")
     columns = [col[1] for col in cursor.fetchall()]
-    
-    url_columns = ['url', 'source', 'link', 'guid']
-    found_column = None
-    for col in url_columns:
+    for col in ['url', 'source', 'link', 'guid']:
         if col in columns:
-            found_column = col
-            break
-    
+            return col
+    return None
+
+@functools.lru_cache(maxsize=4)
+def _url_norm_sql(found_column):
+    """Build the url_norm staging statement once per column name, so
+    repeated exports reuse the identical SQL string and sqlite3's
+    statement cache can keep it prepared"""
+    return f"""
+    CREATE TEMP TABLE url_norm AS
+    SELECT i.{found_column} AS url,
+           lower(replace(replace(i.{found_column}, 'http://', 'https://'),
+                         'https://www.', 'https://')) AS nk,
+           i.updated AS updated
+    FROM search_folder_items sfi
+    JOIN items i ON sfi.item_id = i.item_id
+    WHERE sfi.node_id = ? AND i.{found_column} IS NOT NULL
+    """
+
+def get_article_urls(folder_id, conn, progress_db="progress.db"):
+    """Retrieve (url, normalized_url) pairs from a specific folder,
+    deduplicated on the normalized form. Normalization happens exactly
+    once per URL here; downstream code reuses the precomputed form"""
+    found_column = _url_column(conn)
     if not found_column:
         print("Error: Could not find URL column in items table")
         return []
-    
-    cursor.execute(f"""
-    SELECT i.{found_column}
-    FROM search_folder_items sfi
-    JOIN items i ON sfi.item_id = i.item_id
-    WHERE sfi.node_id = ?
-    ORDER BY i.updated DESC
-    """, (folder_id,))
-    
+
+    cursor = conn.cursor()
+    # Bring the progress DB up to date before the anti-join below reads
+    # it: this creates the tables, imports a legacy news.csv, and - when
+    # the CSV was removed for a rebuild - forgets the processed set, so
+    # the rebuild happens in one pass instead of leaking stale rows into
+    # the filter
+    progress = _open_progress(progress_db)
+    _migrate_processed_from_csv(progress, "news.csv")
+    progress.close()
+    # Attach the progress DB once for the life of the shared connection
+    attached = {row[1] for row in cursor.execute("PRAGMA database_list")}
+    if 'progress' not in attached:
+        cursor.execute("ATTACH DATABASE ? AS progress", (progress_db,))
+
+    # Cheap normalization (scheme, www, case) happens in SQL so SQLite
+    # collapses the bulk of the duplicates in C; the full tracking-param
+    # regex pass below only runs on the survivors
+    cursor.execute(_url_norm_sql(found_column), (folder_id,))
+
+    # Anti-join against the processed table so rows already exported
+    # never cross into Python at all; the in-memory processed_urls set
+    # in export_urls_to_csv still catches the normalization edge cases
+    cursor.execute("""
+    SELECT u.url FROM url_norm u
+    LEFT JOIN progress.processed p ON p.n_url = u.nk
+    WHERE p.n_url IS NULL
+    GROUP BY u.nk
+    ORDER BY MAX(u.updated) DESC
+    """)
+
     seen_urls = set()
     urls = []
-    for row in cursor.fetchall():
+    for row in cursor:
         url = row[0]
         if url:
             normalized = normalize_url(url)
             if normalized and normalized not in seen_urls:
                 seen_urls.add(normalized)
-                urls.append(url)
-    conn.close()
+                urls.append((url, normalized))
+    cursor.execute("DROP TABLE url_norm")
     return urls
 
-def load_processed_urls(filename):
-    """Load already processed URLs from existing CSV"""
-    processed_urls = set()
+def _open_progress(db_path="progress.db"):
+    """Open (creating if needed) the sidecar DB of processed URLs kept
+    next to news.csv, so restarts don't re-parse and re-normalize the
+    whole CSV"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS processed (
+        folder TEXT,
+        n_url TEXT,
+        PRIMARY KEY (folder, n_url)
+    )
+    """)
+    # Promotions survive restarts keyed by normalized URL, so a URL seen
+    # again (e.g. in another folder) skips the LLM subprocess entirely
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS promo (
+        n_url TEXT PRIMARY KEY,
+        promotion TEXT,
+        ts INTEGER
+    )
+    """)
+    return conn
+
+def _migrate_processed_from_csv(progress, filename):
+    """One-time import of an existing news.csv into the progress DB.
+    If the CSV was removed (e.g. via rmcsv), forget the processed set so
+    the file can be rebuilt - mostly from the promo cache, without
+    re-running the LLM"""
+    if not os.path.exists(filename):
+        progress.execute("DELETE FROM processed")
+        progress.commit()
+        return
+    if progress.execute("SELECT 1 FROM processed LIMIT 1").fetchone():
+        return
     try:
-        with open(filename, 'r', encoding='ascii') as csvfile:
+        now = int(time.time())
+        with open(filename, 'r', encoding='ascii', buffering=1 << 20) as csvfile:
             reader = csv.reader(csvfile)
             next(reader)
             for row in reader:
-                if len(row) >= 2:
-                    processed_urls.add(normalize_url(row[1]))
-    except FileNotFoundError:
+                if len(row) < 2:
+                    continue
+                n_url = normalize_url(row[1])
+                progress.execute(
+                    "INSERT OR IGNORE INTO processed (folder, n_url) VALUES (?, ?)",
+                    (row[2] if len(row) >= 3 else '', n_url)
+                )
+                # Keep the promotion text too, so the promo cache starts
+                # warm instead of empty
+                progress.execute(
+                    "INSERT OR IGNORE INTO promo (n_url, promotion, ts) VALUES (?, ?, ?)",
+                    (n_url, row[0], now)
+                )
+        progress.commit()
+    except (FileNotFoundError, StopIteration):
         pass
-    return processed_urls
+
+def load_processed_urls(progress):
+    """Load already processed URLs from the progress DB in one query"""
+    return {row[0] for row in progress.execute("SELECT n_url FROM processed")}
 
 def export_urls_to_csv(folder_title, urls, worker_pool):
-    """Export URLs with promotions to CSV"""
+    """Export URLs with promotions to CSV. urls is a list of
+    (url, normalized_url) pairs from get_article_urls"""
     filename = "news.csv"
-    processed_urls = load_processed_urls(filename)
+    progress = _open_progress()
+    _migrate_processed_from_csv(progress, filename)
+    processed_urls = load_processed_urls(progress)
     new_urls_count = 0
 
-    with open(filename, 'a', newline='', encoding='ascii') as csvfile:
+    # 1 MiB write buffer; rows are flushed in batches below instead of
+    # paying a syscall per row (close() drains whatever remains)
+    with open(filename, 'a', newline='', encoding='ascii', buffering=1 << 20) as csvfile:
         writer = csv.writer(csvfile,
                           quoting=csv.QUOTE_ALL,
                           delimiter=',',
@@ -241,41 +422,90 @@ def export_urls_to_csv(folder_title, urls, worker_pool):
             writer.writerow(['Promotion', 'URL', 'Search Folder Name', 
                            'Duration (Seconds)', 'Ollama Host'])
 
-        with ThreadPoolExecutor(max_workers=len(worker_pool.hosts)) as executor:
-            future_to_url = {
-                executor.submit(
-                    lambda u: (u, determine_promotion(u, worker_pool)),
-                    url
-                ): url 
-                for url in urls 
-                if normalize_url(url) not in processed_urls
-            }
-
-            for future in as_completed(future_to_url):
-                url, (promotion, duration, host) = future.result()
-                normalized = normalize_url(url)
-                
-                if not normalized:
-                    continue
+        # Collect completed rows and write them in slabs; amortizes the
+        # per-call csv quoting overhead alongside the batched flush
+        batch = []
 
-                if promotion == "Error":
-                    print(f"  [!] Failed to generate promotion on {host}: {url[:80]}...")
-                    processed_urls.add(normalized)
-                    continue
+        # Serve cached promotions first, then submit the rest straight to
+        # the worker pool; each Future resolves in the worker thread, so
+        # no extra executor layer is needed here
+        # Look up cached promotions in bulk: one IN query per 500 URLs
+        # instead of a per-row SELECT
+        cached = {}
+        pending = [n for _, n in urls if n not in processed_urls]
+        for start in range(0, len(pending), 500):
+            group = pending[start:start + 500]
+            placeholders = ",".join("?" * len(group))
+            cached.update(progress.execute(
+                f"SELECT n_url, promotion FROM promo WHERE n_url IN ({placeholders})",
+                group
+            ))
 
-                clean_url = clean_text(url)
-                
-                if promotion.startswith("Reject:"):
-                    print(f"  [!] Skipping rejected promotion from {host}: {promotion[:80]}...")
-                    processed_urls.add(normalized)
-                    continue
-                    
-                print(f"  [+] Generated promotion on {host} in {duration:.2f}s: {url[:60]}...")
-                writer.writerow([promotion, clean_url, folder_title, 
-                               f"{duration:.2f}", host])
-                csvfile.flush()
+        future_to_url = {}
+        for url, normalized in urls:
+            if normalized in processed_urls:
+                continue
+            if normalized in cached:
+                print(f"  [+] Reusing cached promotion: {url[:60]}...")
+                # Fold IRIs to ASCII: the CSV is opened with strict
+                # ascii encoding, so non-ASCII path chars would crash
+                # writerows. Much cheaper than the full clean_text pass
+                clean_url = url.encode('ascii', 'ignore').decode('ascii')
+                batch.append([cached[normalized], clean_url, folder_title,
+                            "0.00", "cache"])
                 processed_urls.add(normalized)
+                progress.execute(
+                    "INSERT OR IGNORE INTO processed (folder, n_url) VALUES (?, ?)",
+                    (folder_title, normalized)
+                )
                 new_urls_count += 1
+                continue
+            future_to_url[worker_pool.submit(url)] = (url, normalized)
+
+        for future in as_completed(future_to_url):
+            url, normalized = future_to_url[future]
+            promotion, duration, host = future.result()
+
+            if promotion == "Error":
+                print(f"  [!] Failed to generate promotion on {host}: {url[:80]}...")
+                processed_urls.add(normalized)
+                continue
+
+            if promotion.startswith("Reject:"):
+                print(f"  [!] Skipping rejected promotion from {host}: {promotion[:80]}...")
+                processed_urls.add(normalized)
+                continue
+
+            print(f"  [+] Generated promotion on {host} in {duration:.2f}s: {url[:60]}...")
+            # Fold IRIs to ASCII for the strict-ascii CSV; the full
+            # clean_text pass is only needed for LLM-produced promotions
+            clean_url = url.encode('ascii', 'ignore').decode('ascii')
+            batch.append([promotion, clean_url, folder_title,
+                        f"{duration:.2f}", host])
+            processed_urls.add(normalized)
+            progress.execute(
+                "INSERT OR IGNORE INTO processed (folder, n_url) VALUES (?, ?)",
+                (folder_title, normalized)
+            )
+            progress.execute(
+                "INSERT OR REPLACE INTO promo (n_url, promotion, ts) VALUES (?, ?, ?)",
+                (normalized, promotion, int(time.time()))
+            )
+            new_urls_count += 1
+            if len(batch) >= 64:
+                writer.writerows(batch)
+                batch.clear()
+                csvfile.flush()
+                progress.commit()
+
+        if batch:
+            writer.writerows(batch)
+        # One durable flush for the whole folder instead of per-row
+        # fsync-equivalent flushing
+        csvfile.flush()
+        os.fsync(csvfile.fileno())
+        progress.commit()
+        progress.close()
 
     print(f"\nOperation complete. Processed {new_urls_count} new URLs out of {len(urls)} total.")
     print(f"Results saved to {filename}")
@@ -292,14 +522,19 @@ def main():
     worker_pool.start()
     
     stop_liferea()
-    
+
+    conn = None
     try:
         db_path = str(Path("~/.local/share/liferea/liferea.db").expanduser())
-        
+        # One shared connection for the whole session; every query after
+        # the first hits a warm page cache
+        conn = _open(db_path)
+
         print("\nLiferea URL Exporter")
         print("=" * 50)
-        
-        folders = get_search_folders(db_path)
+
+        ensure_indexes(conn)
+        folders = get_search_folders(conn)
         if not folders:
             print("No search folders found!")
             return
@@ -317,7 +552,7 @@ def main():
                 folder = folders[int(selection)-1]
                 print(f"\nExporting URLs from: {folder['title']}")
                 
-                urls = get_article_urls(folder['id'], db_path)
+                urls = get_article_urls(folder['id'], conn)
                 if not urls:
                     print("No URLs found in this folder")
                     continue
@@ -332,6 +567,10 @@ def main():
     
     finally:
         worker_pool.shutdown()
+        if conn is not None:
+            # Let SQLite refresh planner statistics if queries drifted
+            conn.execute("PRAGMA optimize")
+            conn.close()
 
 if __name__ == "__main__":
     main()
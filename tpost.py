@@ -20,10 +20,14 @@ class Clipboard:
             print(text)
             return False
 
+# Compiled once; validate_promotion runs per CSV row
+_URL_RE = re.compile(r'https?://\S+')
+
 def validate_promotion(promotion, max_length=257):
     """Ensure promotion meets Twitter length requirements"""
-    clean_text = re.sub(r'https?://\S+', '', promotion)
-    return len(clean_text) <= max_length
+    # Count URL characters instead of building the substituted string
+    url_chars = sum(m.end() - m.start() for m in _URL_RE.finditer(promotion))
+    return len(promotion) - url_chars <= max_length
 
 def process_csv(csv_file, max_length=257):
     """Main function to process CSV and prepare tweets"""
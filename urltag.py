@@ -1,20 +1,60 @@
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from bs4 import BeautifulSoup
 import ollama
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# How many page downloads to keep in flight at once
+FETCH_WORKERS = 8
+
+# One session for the whole run: the connection pool keeps sockets (and
+# TLS sessions) alive across same-host URLs instead of handshaking per
+# fetch, and transient failures get a couple of backed-off retries
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
+_SESSION.headers['Accept-Encoding'] = 'gzip'
+
+# How many articles to marshal into a single Ollama call
+BATCH_SIZE = 5
+
+# Only the first ~200 KB of a page can matter: downstream truncates to
+# 2000 chars of text, so stop downloading (and parsing) past that
+MAX_BODY_BYTES = 200 * 1024
+
+# Prefer lxml's C parser when it is installed; html.parser is the
+# pure-Python fallback and the long pole on big article pages
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
 
 def fetch_webpage_content(url):
     try:
-        response = requests.get(url, timeout=10)
+        response = _SESSION.get(url, timeout=10, stream=True)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=8192):
+            body.extend(chunk)
+            if len(body) >= MAX_BODY_BYTES:
+                break
+        response.close()
+        text_body = body.decode(response.encoding or 'utf-8', errors='replace')
+        soup = BeautifulSoup(text_body, PARSER)
         # Remove irrelevant sections
         for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
             tag.decompose()
-        # Try to find article content
-        article = soup.find('article') or soup.find('div', class_=['article-text', 'content'])
-        text = article.get_text(strip=True) if article else soup.get_text(strip=True)
-        return text[:2000]  # Limit to avoid overwhelming Ollama
+        # Try to find article content; walking just <article> (or at
+        # worst <body>) keeps get_text off the head/metadata nodes
+        article = (soup.find('article')
+                   or soup.find('div', class_=['article-text', 'content'])
+                   or soup.body or soup)
+        return article.get_text(' ', strip=True)[:2000]  # Limit to avoid overwhelming Ollama
     except requests.RequestException as e:
         return f"Error fetching URL: {e}"
 
@@ -32,23 +72,79 @@ def generate_tagline(url, content):
     except Exception as e:
         return f"Error generating tagline: {e}"
 
+def generate_taglines(items):
+    """Generate taglines for a batch of (url, content) pairs with a single
+    Ollama call; one prompt amortizes the HTTP round-trip and prompt
+    prefix across the batch. Falls back to per-URL generate_tagline if
+    the model's JSON reply does not parse"""
+    if len(items) == 1:
+        url, content = items[0]
+        return [generate_tagline(url, content)]
+
+    prompt_parts = [
+        "For each numbered article below, write exactly one complete, concise sentence "
+        "(20-40 words, under 280 characters) summarizing its main point. "
+        'Respond ONLY with a JSON array of objects like {"url": "...", "tagline": "..."}, '
+        "one per article, in the same order."
+    ]
+    for i, (url, content) in enumerate(items, 1):
+        prompt_parts.append(f"Article {i} ({url}): {content[:1500]}")
+    prompt = "\n\n".join(prompt_parts)
+
+    try:
+        response = ollama.generate(
+            model='llama3.2', prompt=prompt,
+            options={'num_predict': 60 * len(items), 'temperature': 0.5, 'top_k': 1}
+        )
+        raw = response['response']
+        parsed = json.loads(raw[raw.find('['):raw.rfind(']') + 1])
+        by_url = {entry.get('url'): str(entry.get('tagline', '')).strip()
+                  for entry in parsed}
+    except Exception:
+        return [generate_tagline(url, content) for url, content in items]
+
+    taglines = []
+    for url, content in items:
+        tagline = by_url.get(url)
+        if not tagline:
+            tagline = generate_tagline(url, content)
+        elif len(tagline) > 280:
+            tagline = tagline[:277] + "..."
+        taglines.append(tagline)
+    return taglines
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python urltag.py <url>")
+    if len(sys.argv) < 2:
+        print("Usage: python urltag.py <url> [<url> ...]")
         sys.exit(1)
-    
-    url = sys.argv[1]
-    content = fetch_webpage_content(url)
-    if content.startswith("Error"):
-        print(content)
+
+    urls = sys.argv[1:]
+    # Fetch every page concurrently; the downloads are independent so
+    # wall time is bounded by the slowest page, not the sum of them.
+    # The session's connection pool is sized to match
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        contents = list(pool.map(fetch_webpage_content, urls))
+
+    items = []
+    for url, content in zip(urls, contents):
+        if content.startswith("Error"):
+            print(content)
+            if len(urls) == 1:
+                sys.exit(1)
+            continue
+        items.append((url, content))
+
+    if not items:
         sys.exit(1)
-    
-    tagline = generate_tagline(url, content)
-    if tagline.startswith("Error"):
-        print(tagline)
+
+    failed = False
+    for start in range(0, len(items), BATCH_SIZE):
+        for tagline in generate_taglines(items[start:start + BATCH_SIZE]):
+            print(tagline)
+            if tagline.startswith("Error"):
+                failed = True
+    if failed:
         sys.exit(1)
-    
-    print(tagline)
 
 if __name__ == "__main__":
     main()